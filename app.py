@@ -1,13 +1,15 @@
 import firebase_admin
 from firebase_admin import credentials, firestore
 import json
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 from c4_gameLogic import (
-    is_valid_location, game_is_won, get_valid_locations, create, makeMove,
+    game_is_won, get_valid_locations, create, makeMove,
     isHumTurn, isComputerTurn,
 )
-from c4_constants import ROW_COUNT, COLUMN_COUNT, RED_INT, BLUE_INT, HUMAN, COMPUTER
-import c4_alphaBetaPruning as abp
+from c4_constants import RED_INT, BLUE_INT, HUMAN, COMPUTER
+from c4_ponder import Ponderer
 import time
 
 
@@ -49,6 +51,8 @@ if "winner" not in st.session_state:
     st.session_state["winner"] = None
 if "search_depth" not in st.session_state:
     st.session_state["search_depth"] = 4
+if "ponderer" not in st.session_state:
+    st.session_state["ponderer"] = None
 
 record = st.session_state["record"]
 st.session_state["search_depth"] = 5
@@ -83,19 +87,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# -------------------- STYLE TWEAKS FOR BUTTON SIZE --------------------
-st.markdown("""
-<style>
-div[data-testid="stButton"] > button {
-    padding: 0.25rem 0.25rem !important;  /* narrower padding */
-    font-size: 0.75rem !important;        /* smaller text */
-    border-radius: 8px !important;       /* slightly rounded */
-    width: 100% !important;
-    height: auto !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
 # -------------------- FLOATING RECORD BOX --------------------
 st.markdown(f"""
 <div class="record-box">
@@ -126,28 +117,28 @@ if st.session_state.state is None:
         st.session_state.game_over = False
         st.session_state.winner = None
         st.session_state.search_depth = 4
+        st.session_state.ponderer = Ponderer(st.session_state.search_depth)
         st.rerun()
     else:
         st.stop()
 
 # -------------------- DISPLAY FUNCTIONS --------------------
-def display_board(board):
-    st.write("**Column Numbers:**")
-    cols = st.columns(7)
-    for i, col in enumerate(cols):
-        col.write(f"**{i+1}**")
-
-    for r in reversed(range(ROW_COUNT)):
-        cols = st.columns(7)
-        for c in range(COLUMN_COUNT):
-            with cols[c]:
-                cell = board[r][c]
-                if cell == 0:
-                    st.write("⚪")
-                elif cell == RED_INT:
-                    st.write("🔴")
-                elif cell == BLUE_INT:
-                    st.write("🔵")
+# The whole board (chips, column numbers and column clicks) is one component,
+# instead of 42 emoji cells and 7 buttons that are all rebuilt on every rerun
+_board_component = components.declare_component(
+    "connect4_board", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "board_component")
+)
+
+def display_board(board, enabled):
+    """Draw the board. Returns the column clicked since the last rerun, or None"""
+    cells = "".join(str(c) for c in board.flatten())
+    click = _board_component(cells=cells, enabled=enabled, last=st.session_state.get("last_click"),
+                             key="board", default=None)
+    # The component keeps returning its last click on later reruns; only report new ones
+    if click is None or click["id"] == st.session_state.get("last_click"):
+        return None
+    st.session_state["last_click"] = click["id"]
+    return click["col"]
 
 def game_status():
     """Check and display game result"""
@@ -173,46 +164,48 @@ def game_status():
 
 # -------------------- MAIN GAME DISPLAY --------------------
 board = st.session_state.state[0]
-display_board(board)
+st.session_state.ponderer.depth = st.session_state.search_depth
+clicked_col = display_board(
+    board, enabled=isHumTurn(st.session_state.state) and not st.session_state.game_over
+)
 st.markdown("---")
 
 # -------------------- GAME LOOP --------------------
 if game_status():
     if st.button("Play Again"):
-        for key in ['state', 'game_over', 'winner']:  # Remove 'first_choice'
+        st.session_state.ponderer.stop()
+        for key in ['state', 'game_over', 'winner', 'ponderer']:  # Remove 'first_choice'
             if key in st.session_state:
                 del st.session_state[key]
         st.rerun()
 else:
     if isHumTurn(st.session_state.state) and not st.session_state.game_over:
-        st.write("**Your turn (Red 🔴)**")
-        cols = st.columns(7)
-        for i, col in enumerate(cols):
-            with col:
-                if st.button(f"⬇️ {i+1}", key=f"col_{i}", use_container_width=True):
-                    if is_valid_location(board, i):
-                        makeMove(st.session_state.state, i)
-                        # Check game status and update record HERE
-                        if game_is_won(st.session_state.state[0], RED_INT):
-                            st.session_state.record["Player Wins"] += 1
-                            save_record(st.session_state["record"])
-                            st.session_state.game_over = True
-                        elif game_is_won(st.session_state.state[0], BLUE_INT):
-                            st.session_state.record["AI Wins"] += 1
-                            save_record(st.session_state["record"])
-                            st.session_state.game_over = True
-                        elif len(get_valid_locations(st.session_state.state[0])) == 0:
-                            st.session_state.record["Draws"] += 1
-                            save_record(st.session_state["record"])
-                            st.session_state.game_over = True
-                        st.rerun()
-                    else:
-                        st.error("Column full!")
+        st.write("**Your turn (Red 🔴)** — click a column")
+        # Search the AI's replies while the human is thinking
+        if not st.session_state.ponderer.isPondering():
+            st.session_state.ponderer.start(st.session_state.state)
+        # The board ignores clicks on full columns (and makeMove would too)
+        if clicked_col is not None:
+            makeMove(st.session_state.state, clicked_col)
+            # Check game status and update record HERE
+            if game_is_won(st.session_state.state[0], RED_INT):
+                st.session_state.record["Player Wins"] += 1
+                save_record(st.session_state["record"])
+                st.session_state.game_over = True
+            elif game_is_won(st.session_state.state[0], BLUE_INT):
+                st.session_state.record["AI Wins"] += 1
+                save_record(st.session_state["record"])
+                st.session_state.game_over = True
+            elif len(get_valid_locations(st.session_state.state[0])) == 0:
+                st.session_state.record["Draws"] += 1
+                save_record(st.session_state["record"])
+                st.session_state.game_over = True
+            st.rerun()
 
     elif isComputerTurn(st.session_state.state) and not st.session_state.game_over:
         st.write("**AI is thinking... 🤖**")
         start = time.time()
-        st.session_state.state, col = abp.go(st.session_state.state, st.session_state.search_depth)
+        st.session_state.state, col = st.session_state.ponderer.go(st.session_state.state)
         end = time.time()
         # Check game status and update record HERE
         if game_is_won(st.session_state.state[0], BLUE_INT):
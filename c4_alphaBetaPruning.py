@@ -1,4 +1,5 @@
-import copy
+import math
+import os
 from c4_gameLogic import (
     value, isHumTurn, isFinished, getNext
 )
@@ -16,31 +17,84 @@ The algorithm works by:
 3. Returning both the best value and the resulting state after the best move
 """
 
-def go(s, depth):
+# Profiling is off unless C4_PROFILE names a directory to write profiles to (see c4_profile.py)
+PROFILE_DIR = os.environ.get("C4_PROFILE")
+PROFILE_MODE = os.environ.get("C4_PROFILE_MODE")
+
+# Principal-variation search: after the first (best ordered) child, only test whether
+# each other child beats it with a null window, and search it fully only if it does.
+# The null window is (a, next float after a), so it works for float weights too.
+# Off by default: with moves ordered only by their static value, the probes and
+# re-searches cost more than they save (see python c4_bench.py).
+PVS = False
+
+
+def go(s, depth, profile=None):
     """
     Entry point for alpha-beta pruning.
     Determines whose turn it is and calls the appropriate function.
+    Searches once at the given depth (no iterative deepening).
     
     Args:
-        s: Current game state [board, heuristic_value, whose_turn, empty_cells]
+        s: Current game state (GameState, or the old [board, heuristic_value, whose_turn, empty_cells] list)
         depth: How deep to search in the game tree
+        profile: Directory to write a profile of this move to (default: $C4_PROFILE, usually unset),
+                 or False to never profile it (searches that aren't real AI moves)
     
     Returns:
         The best state to move to (after making the best move)
     """
-    if isHumTurn(s):
-        # Human is MAX (trying to minimize computer's score / maximize their own)
-        result = abmin(s, depth, float("-inf"), float("inf"))
-    else:
-        # Computer is MAX (trying to maximize score)
-        result = abmax(s, depth, float("-inf"), float("inf"))
+    result = profiledSearch(s, depth, profile)
 
     best_state, best_col = result[1]
     
     return best_state, best_col  # Return the best state and the column that was added to
 
 
-def abmax(s, d, a, b):
+def profiledSearch(s, depth, profile=None):
+    """
+    search() for a real AI move: profiled when profiling is on (see go).
+
+    Returns:
+        [value, (best_state, best_col), nodes]
+    """
+    if profile is None:
+        profile = PROFILE_DIR
+    if profile:
+        import c4_profile
+        return c4_profile.profileCall(profile, depth, PROFILE_MODE, search, s, depth)
+    return search(s, depth)
+
+
+class SearchStopped(Exception):
+    """Raised by search when its stop event is set (e.g. pondering that's no longer needed)"""
+
+
+def search(s, depth, stop=None):
+    """
+    Same as go, but also returns the search value and the number of nodes visited.
+
+    Args:
+        stop: threading.Event; the search raises SearchStopped soon after it's set
+
+    Returns:
+        [value, (best_state, best_col), nodes]
+    """
+    ctx = {"nodes": 0, "stop": stop}
+    result = _search(s, depth, float("-inf"), float("inf"), ctx)
+    return [result[0], result[1], ctx["nodes"]]
+
+
+def _search(s, depth, a, b, ctx):
+    if isHumTurn(s):
+        # Human is MAX (trying to minimize computer's score / maximize their own)
+        return abmin(s, depth, a, b, ctx)
+    else:
+        # Computer is MAX (trying to maximize score)
+        return abmax(s, depth, a, b, ctx)
+
+
+def abmax(s, d, a, b, ctx=None):
     """
     Alpha-Beta pruning for MAX player (Computer).
     MAX wants to MAXIMIZE the score.
@@ -50,10 +104,16 @@ def abmax(s, d, a, b):
         d: Current depth (0 when we should stop searching)
         a: Alpha - best value MAX has found so far
         b: Beta - best value MIN can force so far
+        ctx: Per-search context ({"nodes": count, "stop": event or None}), or None
     
     Returns:
         [value, best_state]: The heuristic value and the state after the best move
     """
+    if ctx is not None:
+        ctx["nodes"] += 1
+        if ctx["stop"] is not None and ctx["stop"].is_set():
+            raise SearchStopped()
+
     # BASE CASE: Stop if we've reached max depth or game is finished
     v = value(s)
     if d == 0 or isFinished(s):
@@ -67,9 +127,17 @@ def abmax(s, d, a, b):
     # Move ordering
     next_states.sort(key=lambda x: value(x[0]), reverse=True)
     
-    for child_state, col in next_states:
+    for i, (child_state, col) in enumerate(next_states):
         # Recursively call MIN (opponent's turn)
-        tmp = abmin(copy.deepcopy(child_state), d - 1, a, b)
+        if PVS and i > 0:
+            # Null window: can this move do better than a at all?
+            tmp = abmin(child_state, d - 1, a, math.nextafter(a, math.inf), ctx)
+            if a < tmp[0] < b:
+                # It can: find out by how much. A result above the null window
+                # is a lower bound, so the search can start from it.
+                tmp = abmin(child_state, d - 1, tmp[0], b, ctx)
+        else:
+            tmp = abmin(child_state, d - 1, a, b, ctx)
         
         # If this move is better for MAX, update best move and value
         if tmp[0] > v:
@@ -88,7 +156,7 @@ def abmax(s, d, a, b):
     return [v, best_move]
 
 
-def abmin(s, d, a, b):
+def abmin(s, d, a, b, ctx=None):
     """
     Alpha-Beta pruning for MIN player (Human).
     MIN wants to MINIMIZE the score.
@@ -98,10 +166,16 @@ def abmin(s, d, a, b):
         d: Current depth (0 when we should stop searching)
         a: Alpha - best value MAX can force so far
         b: Beta - best value MIN has found so far
+        ctx: Per-search context ({"nodes": count, "stop": event or None}), or None
     
     Returns:
         [value, best_state]: The heuristic value and the state after the best move
     """
+    if ctx is not None:
+        ctx["nodes"] += 1
+        if ctx["stop"] is not None and ctx["stop"].is_set():
+            raise SearchStopped()
+
     # BASE CASE: Stop if we've reached max depth or game is finished
     v = value(s)
     if d == 0 or isFinished(s):
@@ -115,9 +189,17 @@ def abmin(s, d, a, b):
     # Move ordering
     next_states.sort(key=lambda x: value(x[0]))
     
-    for child_state, col in next_states:
+    for i, (child_state, col) in enumerate(next_states):
         # Recursively call MAX (our turn)
-        tmp = abmax(copy.deepcopy(child_state), d - 1, a, b)
+        if PVS and i > 0:
+            # Null window: can this move do better than b at all?
+            tmp = abmax(child_state, d - 1, math.nextafter(b, -math.inf), b, ctx)
+            if a < tmp[0] < b:
+                # It can: find out by how much. A result below the null window
+                # is an upper bound, so the search can start from it.
+                tmp = abmax(child_state, d - 1, a, tmp[0], ctx)
+        else:
+            tmp = abmax(child_state, d - 1, a, b, ctx)
         
         # If this move is better for MIN, update best move and value
         if tmp[0] < v:
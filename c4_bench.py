@@ -0,0 +1,94 @@
+import argparse
+import random
+import sys
+import time
+import c4_alphaBetaPruning as abp
+from c4_gameLogic import GameState, makeMove, isFinished, get_valid_locations
+
+"""
+Search benchmark for Connect 4
+
+Searches the same set of random positions with plain alpha-beta and with
+principal-variation search, and prints the nodes visited, the time taken and
+whether both found the same values and moves. PVS is off by default in
+c4_alphaBetaPruning because on these positions it doesn't visit fewer nodes.
+
+Usage:
+    python c4_bench.py --depth 5 --positions 20
+    python c4_bench.py --check --depth 4 --positions 20   # exits with 1 on any mismatch
+"""
+
+
+def randomPositions(count, seed=0):
+    """Returns count random unfinished positions of 0 to 15 moves"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        s = GameState()
+        for _ in range(rng.randint(0, 15)):
+            makeMove(s, rng.choice(get_valid_locations(s[0])))
+            if isFinished(s):
+                break
+        if not isFinished(s):
+            positions.append(s)
+    return positions
+
+
+def run(positions, depth, pvs):
+    """Search every position. Returns (results, nodes, seconds), results being (value, column) pairs"""
+    saved, abp.PVS = abp.PVS, pvs
+    results = []
+    nodes = 0
+    start = time.time()
+    for s in positions:
+        v, (best_state, best_col), n = abp.search(s, depth)
+        results.append((v, best_col))
+        nodes += n
+    abp.PVS = saved
+    return results, nodes, time.time() - start
+
+
+def check(seeds, depths, count):
+    """
+    Check that PVS and plain alpha-beta find the same root value and move on
+    random positions for every seed and depth. Returns the number of mismatches.
+    """
+    mismatches = 0
+    for seed in seeds:
+        positions = randomPositions(count, seed)
+        for depth in depths:
+            plain, _, _ = run(positions, depth, pvs=False)
+            pvs, _, _ = run(positions, depth, pvs=True)
+            for s, a, b in zip(positions, plain, pvs):
+                if a != b:
+                    mismatches += 1
+                    print(f"seed {seed} depth {depth} {s.serialize()}: alpha-beta {a}, PVS {b}")
+    print(f"{len(seeds) * len(depths) * count} searches, {mismatches} mismatches")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the alpha-beta search")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true",
+                        help="compare PVS with plain alpha-beta on 10 seeds and every depth up to --depth")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check(range(args.seed, args.seed + 10), range(1, args.depth + 1), args.positions) else 0)
+
+    positions = randomPositions(args.positions, args.seed)
+    plain, plain_nodes, plain_time = run(positions, args.depth, pvs=False)
+    pvs, pvs_nodes, pvs_time = run(positions, args.depth, pvs=True)
+
+    print(f"{len(positions)} positions, depth {args.depth}")
+    print(f"alpha-beta: {plain_nodes} nodes, {plain_time:.2f}s")
+    print(f"PVS:        {pvs_nodes} nodes, {pvs_time:.2f}s ({100 * (1 - pvs_nodes / plain_nodes):.1f}% fewer nodes)")
+    same = sum(a == b for a, b in zip(plain, pvs))
+    print(f"same value and move in {same}/{len(positions)} positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,3 +21,13 @@ TIE = 0                   # Value of a tie
 
 COMPUTER = BLUE_INT       # Agent plays as BLUE
 HUMAN = RED_INT           # Human plays as RED
+
+# Default evaluation weights (see countThreats / checkSequence)
+DEFAULT_WEIGHTS = {
+    "four": 1000000,          # 4 in a window
+    "three": 100000,          # 3 with 1 empty
+    "two": 100,               # 2 with 2 empty
+    "one": 10,                # 1 with 3 empty
+    "center": 3,              # Each chip in the center column
+    "double_trap": 500000,    # 2 or more open 3s
+}
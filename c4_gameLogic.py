@@ -1,4 +1,6 @@
 import copy
+import json
+import os
 import sys
 import numpy as np
 import random
@@ -8,10 +10,39 @@ from c4_constants import (
     RED_CHAR, BLUE_CHAR,
     NEW_RED_CHAR, NEW_BLUE_CHAR,
     VIC, LOSS, TIE,
-    COMPUTER, HUMAN
+    COMPUTER, HUMAN,
+    DEFAULT_WEIGHTS
 )
 
 
+# # # # # # # # # # # # # # EVALUATION WEIGHTS # # # # # # # # # # # # # #
+
+WEIGHTS = dict(DEFAULT_WEIGHTS)
+
+
+def loadWeights(path):
+    """
+    Load evaluation weights from a JSON file (as written by c4_tuner.py).
+    Missing keys keep their current value.
+    """
+    with open(path) as f:
+        weights = json.load(f)
+    setWeights(weights)
+
+
+def setWeights(weights):
+    """Replace some or all evaluation weights"""
+    for key in weights:
+        if key not in DEFAULT_WEIGHTS:
+            raise KeyError(f"Unknown evaluation weight: {key}")
+    WEIGHTS.update(weights)
+
+
+# Weights can be chosen without touching the code: C4_WEIGHTS=weights.json
+if os.environ.get("C4_WEIGHTS"):
+    loadWeights(os.environ["C4_WEIGHTS"])
+
+
 # # # # # # # # # # # # # # BOARD FUNCTIONS # # # # # # # # # # # # # #
 
 def create_board():
@@ -115,18 +146,102 @@ def MoveRandom(board, color):
 # # # # # # # # # # # # # # GAME STATE FUNCTIONS (for alpha-beta) # # # # # # # # # # # # # #
 
 """
-State representation for alpha-beta:
-[board, heuristic_value, whose_turn, empty_cells]
+State representation for alpha-beta: a GameState with
   - board: 6x7 numpy array with 0 (empty), 1 (red/human), 2 (blue/computer)
-  - heuristic_value: score of the position
-  - whose_turn: HUMAN or COMPUTER
-  - empty_cells: number of empty cells remaining
+  - value: heuristic value of the position (cached, updated by makeMove)
+  - turn: HUMAN or COMPUTER
+  - empty: number of empty cells remaining
+  - history: columns played since the state was created
+
+The old list form [board, heuristic_value, whose_turn, empty_cells] still works:
+GameState can be indexed like that list (s[0]..s[3]), and every function below
+accepts either.
 """
 
+class GameState:
+    """Game state for alpha-beta. Indexable as [board, value, turn, empty] for older code."""
+
+    __slots__ = ("board", "value", "turn", "empty", "history", "_key")
+
+    _FIELDS = ("board", "value", "turn", "empty")
+
+    def __init__(self, board=None, value=0, turn=HUMAN, empty=None, history=None):
+        self.board = create_board() if board is None else board
+        self.value = value
+        self.turn = turn
+        self.empty = int((self.board == 0).sum()) if empty is None else empty
+        self.history = [] if history is None else history
+        self._key = None
+
+    # --- List adapters ---
+    def __getitem__(self, i):
+        return getattr(self, GameState._FIELDS[i])
+
+    def __setitem__(self, i, v):
+        setattr(self, GameState._FIELDS[i], v)
+        self._key = None
+
+    def __len__(self):
+        return len(GameState._FIELDS)
+
+    def __iter__(self):
+        return iter((self.board, self.value, self.turn, self.empty))
+
+    @staticmethod
+    def fromList(s):
+        """Returns a GameState for a state in the old list form"""
+        if isinstance(s, GameState):
+            return s
+        return GameState(s[0], s[1], s[2], s[3])
+
+    def toList(self):
+        """Returns the state in the old list form (sharing the board)"""
+        return [self.board, self.value, self.turn, self.empty]
+
+    # --- Copying and hashing ---
+    def copy(self):
+        """Cheap copy: only the board and the history are duplicated"""
+        s = GameState(self.board.copy(), self.value, self.turn, self.empty, self.history[:])
+        s._key = self._key
+        return s
+
+    def key(self):
+        """Hashable (board bytes, turn) for the position, cached until the next move"""
+        if self._key is None:
+            self._key = (self.board.tobytes(), self.turn)
+        return self._key
+
+    def played(self, col):
+        """Record that col was just played (called by makeMove)"""
+        self.history.append(col)
+        self._key = None
+
+    # --- Compact serialization (Streamlit session_state, caches, pickling) ---
+    def serialize(self):
+        """Returns the state as a short string: 42 cells, the turn, then the history"""
+        cells = "".join(str(c) for c in self.board.flatten())
+        return f"{cells}{self.turn}:" + "".join(str(c) for c in self.history)
+
+    @staticmethod
+    def deserialize(text):
+        """Inverse of serialize"""
+        cells, history = text.split(":")
+        board = np.array([int(c) for c in cells[:ROW_COUNT * COLUMN_COUNT]], dtype=int)
+        s = GameState(board.reshape(ROW_COUNT, COLUMN_COUNT), turn=int(cells[-1]),
+                      history=[int(c) for c in history])
+        evaluateBoard(s)
+        return s
+
+    def __reduce__(self):
+        return (GameState.deserialize, (self.serialize(),))
+
+    def __repr__(self):
+        return f"GameState({self.serialize()!r}, value={self.value})"
+
+
 def create():
     """Returns an empty game state. Asks who plays first."""
-    board = create_board()
-    state = [board, 0.00001, HUMAN, ROW_COUNT * COLUMN_COUNT]
+    state = GameState()
 
     # Automatically detect if we're inside Streamlit
     running_in_streamlit = "streamlit" in sys.modules
@@ -134,6 +249,38 @@ def create():
     return state
 
 
+def stateFromBoard(board, turn):
+    """Returns the game state for an existing board, with turn (HUMAN or COMPUTER) to move"""
+    state = GameState(np.array(board, dtype=int), turn=turn)
+    evaluateBoard(state)
+    return state
+
+
+def boardFromMoves(moves):
+    """Returns the board after playing a string of columns (1-7), RED (human) first"""
+    board = create_board()
+    chip = HUMAN
+    for ch in moves:
+        col = int(ch) - 1
+        drop_chip(board, get_next_open_row(board, col), col, chip)
+        chip = COMPUTER + HUMAN - chip
+    return board
+
+
+def stateKey(s):
+    """Hashable (board bytes, turn) for a state in either form"""
+    if isinstance(s, GameState):
+        return s.key()
+    return (s[0].tobytes(), s[2])
+
+
+def copyState(s):
+    """Copy a state in either form"""
+    if isinstance(s, GameState):
+        return s.copy()
+    return copy.deepcopy(s)
+
+
 def value(s):
     """Returns the heuristic value of state s"""
     return s[1]
@@ -146,13 +293,13 @@ def printState(s):
         print(colored("Computer wins!", 'blue'))
     elif value(s) == LOSS:
         print(colored("Human wins!", 'red'))
-    elif value(s) == TIE:
+    elif s[3] == 0:
         print("It's a tie!")
 
 
 def isFinished(s):
     """Returns True if the game ended"""
-    return s[1] in [LOSS, VIC, TIE]
+    return s[1] in [LOSS, VIC] or s[3] == 0
 
 
 def isHumTurn(s):
@@ -191,6 +338,8 @@ def makeMove(s, col):
     drop_chip(s[0], row, col, s[2])
     s[3] -= 1  # Decrement empty cells
     s[2] = COMPUTER + HUMAN - s[2]  # Switch turns
+    if isinstance(s, GameState):
+        s.played(col)
     
     # Re-evaluate board
     evaluateBoard(s)
@@ -226,15 +375,15 @@ def countThreats(board):
     Adds positional and double-trap heuristics.
     Returns: positive score if computer is favored, negative if human is favored.
     """
-    score = 0.00001
+    score = 0
     double_trap_computer = 0
     double_trap_human = 0
     
     # --- Center column control (strategic advantage) ---
     center_col_index = COLUMN_COUNT // 2
     center_col = [board[r][center_col_index] for r in range(ROW_COUNT)]
-    score += center_col.count(COMPUTER) * 3
-    score -= center_col.count(HUMAN) * 3
+    score += center_col.count(COMPUTER) * WEIGHTS["center"]
+    score -= center_col.count(HUMAN) * WEIGHTS["center"]
 
     # --- Check all directions: horizontal, vertical, and both diagonals ---
     directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
@@ -256,9 +405,9 @@ def countThreats(board):
 
     # --- Double trap detection ---
     if comp_threats >= 2:
-        score += 500000  # Strong positional fork
+        score += WEIGHTS["double_trap"]  # Strong positional fork
     if human_threats >= 2:
-        score -= 500000  # Opponent fork is very bad
+        score -= WEIGHTS["double_trap"]  # Opponent fork is very bad
 
     return score
 
@@ -291,23 +440,23 @@ def checkSequence(board, start_row, start_col, dr, dc):
 
     # --- Scoring ---
     if computer_count == 4:
-        score += 1000000  # Win is ultimate goal
+        score += WEIGHTS["four"]  # Win is ultimate goal
     elif human_count == 4:
-        score -= 1000000
+        score -= WEIGHTS["four"]
     elif computer_count == 3 and empty_count == 1:
-        score += 100000   # Near-win is next best
+        score += WEIGHTS["three"]  # Near-win is next best
         threat_flag = "COMP_THREAT"
     elif human_count == 3 and empty_count == 1:
-        score -= 100000   
+        score -= WEIGHTS["three"]
         threat_flag = "HUM_THREAT"
     elif computer_count == 2 and empty_count == 2:
-        score += 100      # 2 with 2 empty is good
+        score += WEIGHTS["two"]  # 2 with 2 empty is good
     elif human_count == 2 and empty_count == 2:
-        score -= 100      
+        score -= WEIGHTS["two"]
     elif computer_count == 1 and empty_count == 3:
-        score += 10     # 1 with 3 empty is okay
+        score += WEIGHTS["one"]  # 1 with 3 empty is okay
     elif human_count == 1 and empty_count == 3:
-        score -= 10
+        score -= WEIGHTS["one"]
 
     return (score, threat_flag)
 
@@ -327,12 +476,12 @@ def getValidMoves(s):
 def getNext(s):
     """
     Returns a list of all possible next states.
-    Each state is a deep copy with one valid move applied.
+    Each state is a copy with one valid move applied.
     """
     next_states = []
     
     for col in getValidMoves(s):
-        tmp = copy.deepcopy(s)
+        tmp = copyState(s)
         makeMove(tmp, col)
         next_states.append((tmp, col))
     
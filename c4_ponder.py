@@ -0,0 +1,165 @@
+import threading
+import c4_alphaBetaPruning as abp
+from c4_gameLogic import (
+    value, isHumTurn, isFinished, getNext, stateKey, copyState, makeMove
+)
+
+"""
+Pondering for Connect 4
+
+While the human is thinking the CPU is otherwise idle. The Ponderer uses that
+time to search the computer's answer to each of the human's possible replies
+in a background thread, so that when the human actually moves the answer is
+usually already waiting.
+
+The answers are kept in a table shared by every Ponderer, keyed by the
+position and the search depth, so a position that was already searched
+(by pondering or by a normal move) is never searched twice. This is a table
+of root answers only: the search itself doesn't consult it, so pondering a
+position doesn't speed up a different search that transposes into it.
+"""
+
+# Shared table of finished searches: (board bytes, whose_turn, depth) -> (best_col, value)
+# Only the column is kept: the state is rebuilt from the caller's own state, whose
+# history belongs to its game (the same position can come from different games).
+MAX_ANSWERS = 100000      # The table is emptied when it grows past this size
+_answers = {}
+_answers_lock = threading.Lock()
+
+
+def positionKey(s, depth):
+    """Returns the key used to store the answer for state s at a given depth"""
+    return stateKey(s) + (depth,)
+
+
+def lookup(s, depth):
+    """
+    Returns the stored answer (best_state, best_col) for state s, or None if it was not
+    searched yet. best_state is a copy of s with best_col played.
+    """
+    with _answers_lock:
+        answer = _answers.get(positionKey(s, depth))
+    if answer is None:
+        return None
+    best_col, v = answer
+    best_state = copyState(s)
+    makeMove(best_state, best_col)
+    return best_state, best_col
+
+
+def contains(s, depth):
+    """Returns True if the answer for state s is stored"""
+    with _answers_lock:
+        return positionKey(s, depth) in _answers
+
+
+def store(s, depth, best_col, v):
+    """Store the best column and search value found for state s"""
+    with _answers_lock:
+        if len(_answers) >= MAX_ANSWERS:
+            _answers.clear()
+        _answers[positionKey(s, depth)] = (best_col, v)
+
+
+def clear():
+    """Forget every stored answer (e.g. when a new game starts)"""
+    with _answers_lock:
+        _answers.clear()
+
+
+def go(s, depth):
+    """
+    Same as c4_alphaBetaPruning.go, but reuses a stored answer when there is one
+    and stores the answer it computes.
+    """
+    answer = lookup(s, depth)
+    if answer is None:
+        v, answer, nodes = abp.profiledSearch(s, depth)
+        store(s, depth, answer[1], v)
+    return answer
+
+
+class Ponderer:
+    """
+    Searches the computer's replies to every possible human move in a background thread.
+
+    Usage:
+        ponderer = Ponderer(depth)
+        ponderer.start(state)          # right after the computer moved
+        ...                            # human thinks and moves
+        state, col = ponderer.go(state)  # instant if the reply was pondered
+    """
+
+    def __init__(self, depth):
+        self.depth = depth
+        self._thread = None
+        self._stop = None
+        self._searching = None     # key of the position currently being searched
+        self._done = threading.Condition()
+
+    def start(self, s):
+        """
+        Start pondering on state s, where it's the human's turn.
+        Any previous pondering is stopped first.
+        """
+        self.stop()
+        if not isHumTurn(s) or isFinished(s):
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(copyState(s), self._stop), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread and wait for it to exit. The search that is
+        running is abandoned, so it doesn't compete with the caller's own search.
+        """
+        if self._stop is not None:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def isPondering(self):
+        """Returns True while the background thread is still searching"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, s, stop):
+        """Search the computer's answer to each human reply, most likely replies first"""
+        next_states = getNext(s)
+        # Same move ordering as abmin: the human's best looking replies first
+        next_states.sort(key=lambda x: value(x[0]))
+
+        for child_state, col in next_states:
+            if isFinished(child_state):
+                continue
+            # Check and claim the position in one step, so go() either finds it
+            # stored, waits for it, or searches it itself - never twice at once
+            with self._done:
+                if stop.is_set():
+                    break
+                if contains(child_state, self.depth):
+                    continue
+                self._searching = positionKey(child_state, self.depth)
+            try:
+                v, (best_state, best_col), nodes = abp.search(child_state, self.depth, stop=stop)
+                store(child_state, self.depth, best_col, v)
+            except abp.SearchStopped:
+                break
+            finally:
+                with self._done:
+                    self._searching = None
+                    self._done.notify_all()
+
+    def go(self, s):
+        """
+        Returns the computer's move (best_state, best_col) for state s.
+        Uses the pondered answer if it's ready, waits for it if it's being searched
+        right now, and otherwise stops pondering and searches as usual.
+        """
+        key = positionKey(s, self.depth)
+        with self._done:
+            while self._searching == key:
+                self._done.wait()
+        self.stop()
+        return go(s, self.depth)
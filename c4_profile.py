@@ -0,0 +1,92 @@
+import cProfile
+import itertools
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+"""
+Profiling of single AI moves
+
+Turned on with an environment variable (or the profile argument of
+c4_alphaBetaPruning.go), and off by default:
+    C4_PROFILE=profiles python connect4.py
+    C4_PROFILE=profiles C4_PROFILE_MODE=sample streamlit run app.py
+
+For every AI move one set of files is written to the C4_PROFILE directory.
+Searches that aren't AI moves (pondering, self-play in c4_tuner) are not profiled.
+  - cprofile mode (default):
+      move_<pid>_<n>_d<depth>.prof   pstats file (python -m pstats, snakeviz, ...)
+      move_<pid>_<n>_d<depth>.txt    call counts and times per function
+  - sample mode (lower overhead, for timing rather than exact call counts):
+      move_<pid>_<n>_d<depth>.folded collapsed stacks, ready for flamegraph.pl / speedscope
+
+When C4_PROFILE is not set this module isn't even imported.
+"""
+
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.001   # Seconds between two stack samples in sample mode
+
+_moves = itertools.count(1)
+
+
+def _basename(directory, depth):
+    """Returns the path (without extension) for the files of the next profiled move"""
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"move_{os.getpid()}_{next(_moves):04d}_d{depth}")
+
+
+def profileCall(directory, depth, mode, fn, *args):
+    """
+    Call fn(*args) under the chosen profiler and write its output to directory.
+    Returns what fn returned.
+    """
+    mode = mode or "cprofile"
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(MODES)})")
+    base = _basename(directory, depth)
+    if mode == "sample":
+        return _sampled(base, fn, *args)
+    return _cprofiled(base, fn, *args)
+
+
+def _cprofiled(base, fn, *args):
+    """Run fn under cProfile; write the .prof file and a text summary"""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".txt", "w") as f:
+            stats = pstats.Stats(profiler, stream=f)
+            stats.sort_stats("cumulative").print_stats(40)
+
+
+def _sampled(base, fn, *args):
+    """Run fn while a background thread samples its stack; write collapsed stacks"""
+    target = threading.get_ident()
+    stacks = Counter()
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                stacks[";".join(reversed(stack))] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        return fn(*args)
+    finally:
+        done.set()
+        sampler.join()
+        with open(base + ".folded", "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
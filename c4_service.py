@@ -0,0 +1,230 @@
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import c4_alphaBetaPruning as abp
+from c4_gameLogic import stateFromBoard, boardFromMoves, isFinished, get_valid_locations
+from c4_constants import ROW_COUNT, COLUMN_COUNT, RED_INT, BLUE_INT, HUMAN, COMPUTER
+
+"""
+Stateless HTTP/JSON move service for Connect 4
+
+Runs the engine on its own, away from the CLI and the Streamlit app, so it can
+be scaled (and load-tested) separately from the UI. Searches run in a pool of
+worker processes that is started once and kept warm. Answers are cached, and
+concurrent requests for the same position share one search instead of each
+starting their own.
+
+Request (POST /move):
+    {"moves": "4453"}                        columns played so far (1-7), RED first
+    {"board": [[...], ...], "turn": "blue"}  6x7 board, row 0 at the bottom, 0/1 (red)/2 (blue)
+  plus either
+    "depth": 5                               search depth (default 5)
+    "time": 0.5                              time budget in seconds (iterative deepening, at most MAX_TIME)
+
+Response:
+    {"column": 4, "score": 123.0, "depth": 5, "nodes": 1325, "time_ms": 40.1, "cached": false, "shared": false}
+  - column: the best column (1-7)
+  - nodes: nodes visited by the search (all depths with a time budget)
+  - cached: the answer came from the cache
+  - shared: the answer came from a search started by another, concurrent request
+
+Usage:
+    python c4_service.py --port 8000 --processes 4
+    curl -d '{"moves": "44", "depth": 6}' http://localhost:8000/move
+"""
+
+DEFAULT_DEPTH = 5
+MAX_DEPTH = 12
+MAX_TIME = 10.0         # Longest time budget (seconds) a request may ask for
+MAX_CACHE = 100000      # The cache is emptied when it grows past this size
+
+
+# # # # # # # # # # # # # # SEARCH (runs in the worker processes) # # # # # # # # # # # # # #
+
+def searchPosition(board, turn, depth, time_budget):
+    """
+    Search one position. With a time budget, search depth 1, 2, ... and stop before
+    the next depth is likely to go over the budget (each depth costs a few times the one before).
+    Returns a dict with column, score, depth and nodes.
+    """
+    s = stateFromBoard(board, turn)
+    start = time.time()
+
+    if time_budget is None:
+        v, (best_state, best_col), nodes = abp.search(s, depth)
+        return {"column": best_col + 1, "score": v, "depth": depth, "nodes": nodes}
+
+    d = 0
+    total_nodes = 0
+    while d < MAX_DEPTH and d < s[3]:
+        d += 1
+        depth_start = time.time()
+        v, (best_state, best_col), nodes = abp.search(s, d)
+        total_nodes += nodes
+        spent = time.time() - depth_start
+        if (time.time() - start) + spent * COLUMN_COUNT > time_budget:
+            break
+    return {"column": best_col + 1, "score": v, "depth": d, "nodes": total_nodes}
+
+
+# # # # # # # # # # # # # # REQUEST HANDLING # # # # # # # # # # # # # #
+
+class BadRequest(Exception):
+    """The request can't be answered (bad JSON, illegal or finished position...)"""
+
+
+def parsePosition(request):
+    """Returns (board, turn) for a request dict"""
+    if "moves" in request:
+        moves = str(request["moves"])
+        if any(ch not in "1234567" for ch in moves):
+            raise BadRequest("moves must be a string of columns 1-7")
+        if any(moves.count(ch) > ROW_COUNT for ch in "1234567"):
+            raise BadRequest("moves overfill a column")
+        board = boardFromMoves(moves)
+        turn = HUMAN if len(moves) % 2 == 0 else COMPUTER
+    elif "board" in request:
+        board = np.array(request["board"], dtype=int)
+        if board.shape != (ROW_COUNT, COLUMN_COUNT) or not np.isin(board, [0, RED_INT, BLUE_INT]).all():
+            raise BadRequest(f"board must be {ROW_COUNT}x{COLUMN_COUNT} of 0 (empty), 1 (red), 2 (blue)")
+        # No chip may float above an empty cell (row 0 is the bottom)
+        if ((board[1:] != 0) & (board[:-1] == 0)).any():
+            raise BadRequest("board has a chip above an empty cell")
+        reds = int((board == RED_INT).sum())
+        blues = int((board == BLUE_INT).sum())
+        if abs(reds - blues) > 1:
+            raise BadRequest("red and blue chip counts differ by more than one")
+        if reds > blues:
+            turn = COMPUTER
+        elif blues > reds:
+            turn = HUMAN
+        else:
+            turn = {"red": HUMAN, "blue": COMPUTER}.get(request.get("turn", "red"))
+            if turn is None:
+                raise BadRequest("turn must be 'red' or 'blue'")
+    else:
+        raise BadRequest("request needs 'moves' or 'board'")
+    return board, turn
+
+
+class MoveService:
+    """Warm process pool + answer cache + sharing of concurrent searches of the same position"""
+
+    def __init__(self, processes=None):
+        processes = processes or os.cpu_count()
+        self.pool = ProcessPoolExecutor(processes)
+        self._cache = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        # Start every worker now, so that the first requests don't pay for it
+        warmup = [self.pool.submit(searchPosition, np.zeros((ROW_COUNT, COLUMN_COUNT), dtype=int), HUMAN, 1, None)
+                  for _ in range(processes)]
+        for f in warmup:
+            f.result()
+
+    def move(self, request):
+        """Answer one request dict. Returns the response dict"""
+        start = time.time()
+        board, turn = parsePosition(request)
+
+        time_budget = request.get("time")
+        depth = request.get("depth", DEFAULT_DEPTH)
+        if time_budget is not None:
+            if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)):
+                raise BadRequest("time must be a number of seconds")
+            time_budget = float(time_budget)
+            if math.isnan(time_budget) or time_budget <= 0:
+                raise BadRequest("time must be positive")
+            time_budget = min(time_budget, MAX_TIME)
+            depth = None
+        elif isinstance(depth, bool) or not isinstance(depth, int) or not 1 <= depth <= MAX_DEPTH:
+            raise BadRequest(f"depth must be an integer between 1 and {MAX_DEPTH}")
+
+        if isFinished(stateFromBoard(board, turn)) or len(get_valid_locations(board)) == 0:
+            raise BadRequest("the game is already over")
+
+        key = (board.tobytes(), turn, depth, time_budget)
+        cached = shared = False
+        with self._lock:
+            answer = self._cache.get(key)
+            if answer is not None:
+                cached = True
+            else:
+                future = self._inflight.get(key)
+                if future is not None:
+                    shared = True
+                else:
+                    future = self.pool.submit(searchPosition, board, turn, depth, time_budget)
+                    self._inflight[key] = future
+        if answer is None:
+            try:
+                answer = future.result()
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+            with self._lock:
+                if len(self._cache) >= MAX_CACHE:
+                    self._cache.clear()
+                self._cache[key] = answer
+
+        return dict(answer, time_ms=(time.time() - start) * 1000, cached=cached, shared=shared)
+
+
+def makeHandler(service):
+    """Returns the HTTP request handler class for a MoveService"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/move":
+                self.reply(404, {"error": "unknown path"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise BadRequest("request must be a JSON object")
+                self.reply(200, service.move(request))
+            except (BadRequest, ValueError, TypeError) as e:
+                self.reply(400, {"error": str(e)})
+
+        def reply(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # One line per request is too much under load
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect 4 move service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    service = MoveService(args.processes)
+    server = ThreadingHTTPServer((args.host, args.port), makeHandler(service))
+    print(f"Connect 4 move service on http://{args.host}:{args.port}/move")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
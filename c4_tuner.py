@@ -0,0 +1,231 @@
+import argparse
+import json
+import random
+from multiprocessing import Pool
+import numpy as np
+import c4_alphaBetaPruning as abp
+from c4_gameLogic import (
+    game_is_won, get_valid_locations, makeMove, isFinished, setWeights, WEIGHTS,
+    GameState, boardFromMoves
+)
+from c4_constants import (
+    ROW_COUNT, COLUMN_COUNT, COMPUTER, HUMAN, DEFAULT_WEIGHTS
+)
+
+"""
+Offline tuning of the evaluation weights
+
+countThreats is a weighted sum of a few features (open 1s/2s/3s, center chips,
+double traps), so it can be written as features(board) . weights. This module
+computes the features for many boards at once with numpy, fits the weights with
+logistic regression against game results, and writes them as JSON for
+c4_gameLogic.loadWeights (or C4_WEIGHTS=weights.json).
+
+Positions come from a labelled file, one position per line:
+    <moves> <result>
+  - moves: the columns played (1-7) from the empty board, RED (human) first, e.g. 4453
+  - result: 1 if the computer (BLUE) won, -1 if the human (RED) won, 0 for a draw
+or from self-play games, played in parallel by several processes.
+
+Usage:
+    python c4_tuner.py --positions positions.txt --out weights.json
+    python c4_tuner.py --selfplay 200 --depth 2 --processes 4 --save-positions positions.txt
+"""
+
+FEATURES = ["four", "three", "two", "one", "center", "double_trap"]
+TUNED = ["three", "two", "one", "center", "double_trap"]   # "four" never shows up in non-final positions
+
+
+def _windows():
+    """Flat board indices (row * COLUMN_COUNT + col) of every 4-cell window"""
+    windows = []
+    for row in range(ROW_COUNT):
+        for col in range(COLUMN_COUNT):
+            for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                end_row = row + 3 * dr
+                end_col = col + 3 * dc
+                if 0 <= end_row < ROW_COUNT and 0 <= end_col < COLUMN_COUNT:
+                    windows.append([(row + i * dr) * COLUMN_COUNT + col + i * dc for i in range(4)])
+    return np.array(windows)
+
+
+WINDOWS = _windows()
+CENTER = np.arange(ROW_COUNT) * COLUMN_COUNT + COLUMN_COUNT // 2
+
+
+# # # # # # # # # # # # # # BATCHED EVALUATION # # # # # # # # # # # # # #
+
+def features(boards):
+    """
+    Returns an (N, len(FEATURES)) array of feature counts for an (N, ROW_COUNT, COLUMN_COUNT)
+    array of boards. Each count is computer minus human, as in countThreats.
+    """
+    flat = boards.reshape(len(boards), ROW_COUNT * COLUMN_COUNT)
+    windows = flat[:, WINDOWS]
+    comp = (windows == COMPUTER).sum(axis=2)
+    hum = (windows == HUMAN).sum(axis=2)
+
+    # Windows with chips of both players are blocked and count for nothing
+    def open_windows(n):
+        return ((comp == n) & (hum == 0)).sum(axis=1) - ((hum == n) & (comp == 0)).sum(axis=1)
+
+    comp_threats = ((comp == 3) & (hum == 0)).sum(axis=1)
+    hum_threats = ((hum == 3) & (comp == 0)).sum(axis=1)
+    center = (flat[:, CENTER] == COMPUTER).sum(axis=1) - (flat[:, CENTER] == HUMAN).sum(axis=1)
+
+    return np.stack([
+        open_windows(4),
+        open_windows(3),
+        open_windows(2),
+        open_windows(1),
+        center,
+        (comp_threats >= 2).astype(int) - (hum_threats >= 2).astype(int),
+    ], axis=1).astype(float)
+
+
+def evaluate(boards, weights=None):
+    """Returns countThreats for every board in an (N, ROW_COUNT, COLUMN_COUNT) array"""
+    weights = WEIGHTS if weights is None else weights
+    return features(boards) @ np.array([weights[f] for f in FEATURES], dtype=float)
+
+
+# # # # # # # # # # # # # # POSITIONS # # # # # # # # # # # # # #
+
+def loadPositions(path):
+    """Read a labelled positions file. Returns (boards, results)"""
+    boards, results = [], []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            moves, result = line.split()
+            boards.append(boardFromMoves(moves))
+            results.append(int(result))
+    return np.array(boards), np.array(results)
+
+
+def savePositions(path, games):
+    """
+    Write every non-final position of each (moves, result) game to a labelled positions file.
+    The empty board is skipped: it has no features to fit, and no moves to write.
+    """
+    with open(path, "w") as f:
+        for moves, result in games:
+            for i in range(1, len(moves)):
+                f.write(f"{moves[:i]} {result}\n")
+
+
+def playGame(args):
+    """
+    Play one self-play game (run in a worker process).
+    Both sides use alpha-beta at the given depth after a few random opening moves,
+    so that games differ from each other. Returns (moves, result).
+    """
+    depth, random_moves, weights, seed = args
+    setWeights(weights)
+    rng = random.Random(seed)
+
+    state = GameState()
+    moves = ""
+    while not isFinished(state):
+        if len(moves) < random_moves:
+            col = rng.choice(get_valid_locations(state[0]))
+            makeMove(state, col)
+        else:
+            state, col = abp.go(state, depth, profile=False)  # Not a real AI move
+        moves += str(col + 1)
+
+    if game_is_won(state[0], COMPUTER):
+        return moves, 1
+    if game_is_won(state[0], HUMAN):
+        return moves, -1
+    return moves, 0
+
+
+def selfPlay(games, depth=2, random_moves=4, processes=None, seed=0):
+    """Play games in parallel with the current weights. Returns a list of (moves, result)"""
+    jobs = [(depth, random_moves, dict(WEIGHTS), seed + i) for i in range(games)]
+    with Pool(processes) as pool:
+        return pool.map(playGame, jobs)
+
+
+def gamesToPositions(games):
+    """Turn (moves, result) games into (boards, results) arrays of their non-final positions (as savePositions)"""
+    boards, results = [], []
+    for moves, result in games:
+        for i in range(1, len(moves)):
+            boards.append(boardFromMoves(moves[:i]))
+            results.append(result)
+    return np.array(boards), np.array(results)
+
+
+# # # # # # # # # # # # # # FITTING # # # # # # # # # # # # # #
+
+def fit(boards, results, epochs=2000, rate=0.1, l2=1e-4):
+    """
+    Fit the weights with logistic regression: P(computer wins) = sigmoid(features . weights).
+    Draws count as half a win. Returns a weights dict in the same scale as DEFAULT_WEIGHTS
+    (the "three" weight is kept at its default and the rest scaled to it).
+    """
+    X = features(boards)[:, [FEATURES.index(f) for f in TUNED]]
+    y = (results + 1) / 2
+
+    # Standardize so that one learning rate fits all features
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1
+    X = X / scale
+
+    theta = np.zeros(X.shape[1])
+    for _ in range(epochs):
+        p = 1 / (1 + np.exp(-(X @ theta)))
+        grad = X.T @ (p - y) / len(y) + l2 * theta
+        theta -= rate * grad
+    theta /= scale
+
+    three = theta[TUNED.index("three")]
+    if three <= 0:
+        raise ValueError("Fitted weights are degenerate (open 3s do not predict wins); use more positions")
+
+    weights = dict(DEFAULT_WEIGHTS)
+    for f, t in zip(TUNED, theta):
+        weights[f] = float(t * DEFAULT_WEIGHTS["three"] / three)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the Connect 4 evaluation weights")
+    parser.add_argument("--positions", help="labelled positions file to fit on")
+    parser.add_argument("--selfplay", type=int, default=0, help="number of self-play games to add")
+    parser.add_argument("--depth", type=int, default=2, help="search depth used in self-play")
+    parser.add_argument("--random-moves", type=int, default=4, help="random opening moves per self-play game")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes for self-play")
+    parser.add_argument("--save-positions", help="also write the self-play positions to this file")
+    parser.add_argument("--epochs", type=int, default=2000)
+    parser.add_argument("--out", default="weights.json", help="where to write the fitted weights")
+    args = parser.parse_args()
+
+    boards = np.zeros((0, ROW_COUNT, COLUMN_COUNT), dtype=int)
+    results = np.zeros(0, dtype=int)
+    if args.positions:
+        boards, results = loadPositions(args.positions)
+    if args.selfplay:
+        games = selfPlay(args.selfplay, args.depth, args.random_moves, args.processes)
+        if args.save_positions:
+            savePositions(args.save_positions, games)
+        more_boards, more_results = gamesToPositions(games)
+        boards = np.concatenate([boards, more_boards])
+        results = np.concatenate([results, more_results])
+    if len(boards) == 0:
+        parser.error("nothing to fit on: give --positions and/or --selfplay")
+
+    weights = fit(boards, results, epochs=args.epochs)
+    with open(args.out, "w") as f:
+        json.dump(weights, f, indent=2)
+    print(f"Fitted on {len(boards)} positions, wrote {args.out}:")
+    for f_name in FEATURES:
+        print(f"  {f_name}: {weights[f_name]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from termcolor import colored
-import c4_alphaBetaPruning as abp
+from c4_ponder import Ponderer
 from c4_gameLogic import create, print_board, is_valid_location, makeMove, isHumTurn, isComputerTurn, print_board_after_turn, game_is_won, get_valid_locations
 from c4_constants import (
     RED_INT, BLUE_INT,
@@ -8,6 +8,7 @@ from c4_constants import (
 
 if __name__ == "__main__":
     SEARCH_DEPTH = 5
+    ponderer = Ponderer(SEARCH_DEPTH)  # Searches the AI's replies while the human thinks
     state = create()  # Get the starting state
     board = state[0]
     print_board(board)
@@ -15,6 +16,7 @@ if __name__ == "__main__":
     
     while not game_over:
         if isHumTurn(state) and not game_over: # Human's turn
+            ponderer.start(state)
             col = int(input(colored("RED please choose a column(1-7): ", 'red')))
             while col > 7 or col < 1:
                 col = int(input("Invalid column, pick a valid one: "))
@@ -32,7 +34,7 @@ if __name__ == "__main__":
             # record time for performance measurement if needed
             import time
             start = time.time()  
-            state, col = abp.go(state, SEARCH_DEPTH)
+            state, col = ponderer.go(state)
             # result will be the best state after agent's move
             board = state[0]
             end = time.time()